@@ -87,6 +87,24 @@ summarizer_agent = create_base_agent(
     You have a keen eye for identifying key points and maintaining the essence of the original content."""
 )
 
+def create_article_summarizer_agent() -> Agent:
+    """Create a standalone agent for summarizing one article.
+
+    Async tasks run in their own threads and crewai agents keep per-task state
+    on a single executor, so each concurrent summary needs its own agent. It
+    has no tools, memory or delegation, so it cannot reach other agents.
+    """
+    return Agent(
+        role="Article Summarizer",
+        goal="Summarize a single news article accurately and concisely",
+        backstory="""You are an expert at distilling news articles into clear, concise summaries
+    while keeping their key facts and sources intact.""",
+        verbose=True,
+        allow_delegation=False,
+        memory=False,
+        llm=llm
+    )
+
 headline_agent = create_base_agent(
     role="Headline Creator",
     goal="Create engaging and accurate headlines that capture the essence of the content",
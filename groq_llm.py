@@ -1,8 +1,45 @@
+import os
+import threading
+from contextlib import contextmanager
+from langchain.globals import set_llm_cache
+from langchain_community.cache import SQLiteCache
+from langchain_core.callbacks import BaseCallbackHandler
 from langchain_groq import ChatGroq
-from utils.config import GROQ_API_KEY
+from utils.config import GROQ_API_KEY, LLM_CACHE_PATH
+
+# Serve repeated prompts from a local cache instead of calling Groq again
+os.makedirs(os.path.dirname(LLM_CACHE_PATH), exist_ok=True)
+set_llm_cache(SQLiteCache(database_path=LLM_CACHE_PATH))
+
+
+class TokenStreamHandler(BaseCallbackHandler):
+    """Forward streamed LLM tokens to a sink registered by the calling thread."""
+
+    def __init__(self):
+        # The LLM is shared, so each thread (Streamlit session) has its own sink
+        self._local = threading.local()
+
+    @contextmanager
+    def stream_to(self, sink):
+        """Send tokens generated on this thread to sink(token) while the block runs."""
+        self._local.sink = sink
+        try:
+            yield
+        finally:
+            self._local.sink = None
+
+    def on_llm_new_token(self, token: str, **kwargs) -> None:
+        sink = getattr(self._local, "sink", None)
+        if sink is not None:
+            sink(token)
+
+
+token_stream = TokenStreamHandler()
 
 llm = ChatGroq(
     groq_api_key=GROQ_API_KEY,
     model_name="llama3-70b-8192",
-    temperature=0.3
+    temperature=0.3,
+    streaming=True,
+    callbacks=[token_stream]
 )
@@ -1,28 +1,66 @@
 import streamlit as st
-from crewai import Crew, Task
-from agents.domain_agents import (
-    summarizer_agent,
-    headline_agent,
-    news_analyst_agent,
-    translator_agent
-)
+from typing import List, Dict, Tuple, TYPE_CHECKING
 from utils.tools import TranslationTool, WebSearchTool, WebScrapingTool
-from groq_llm import llm
-from utils.vector_store import vector_store
 from datetime import datetime
-from utils.text_processor import split_into_chunks, combine_chunks, get_text_stats, format_stats
-import json
+from utils.text_processor import TextBundle, make_bundle, split_into_translation_chunks, combine_chunks, get_text_stats, format_stats, contains_bengali
+from utils.config import MAX_ARTICLE_CHARS
+import orjson
+import asyncio
+import time
+
+# CrewAI, the agents and the vector store are heavy to import, so each branch imports what it uses
+if TYPE_CHECKING:
+    from crewai import Crew, Task
+
+@st.cache_resource
+def get_translation_tool() -> TranslationTool:
+    """Share one translation tool, and its cache, across Streamlit reruns."""
+    return TranslationTool()
 
 # Initialize tools
-translation_tool = TranslationTool()
+translation_tool = get_translation_tool()
 web_search_tool = WebSearchTool()
 web_tool = WebScrapingTool()
 
-def create_summarization_task(content: str) -> Task:
+@st.cache_data(show_spinner=False, max_entries=64)
+def get_stats_summary(text: str) -> Tuple[Dict[str, int], str]:
+    """Text statistics and their display string, cached across Streamlit reruns."""
+    stats = get_text_stats(text)
+    return stats, format_stats(stats)
+
+def kickoff_streaming(crew: "Crew") -> str:
+    """Run the crew, showing LLM tokens in a placeholder as they arrive."""
+    from groq_llm import token_stream
+    
+    placeholder = st.empty()
+    tokens = []
+    last_update = 0.0
+    
+    def show_token(token: str) -> None:
+        nonlocal last_update
+        tokens.append(token)
+        # Re-render at most every 100 ms so long outputs don't flood the frontend
+        now = time.monotonic()
+        if now - last_update >= 0.1:
+            placeholder.markdown("".join(tokens))
+            last_update = now
+    
+    with token_stream.stream_to(show_token):
+        result = crew.kickoff()
+    placeholder.empty()
+    return result
+
+def create_summarization_task(content: str) -> "Task":
+    from crewai import Task
+    from agents.domain_agents import summarizer_agent
+    from utils.vector_store import get_vector_store
+    vector_store = get_vector_store()
+    
     # Store the content in ChromaDB for future reference
-    vector_store.add_documents(
+    timestamp = datetime.now().isoformat(timespec="seconds")
+    vector_store.queue_documents(
         documents=[content],
-        metadatas=[{"type": "content", "timestamp": str(datetime.now())}]
+        metadatas=[{"type": "content", "timestamp": timestamp}]
     )
     
     return Task(
@@ -37,9 +75,12 @@ def create_summarization_task(content: str) -> Task:
         agent=summarizer_agent
     )
 
-def create_headline_task(content: str) -> Task:
+def create_headline_task(content: str) -> "Task":
+    from crewai import Task
+    from agents.domain_agents import headline_agent
+    
     # Detect if the content is in Bengali
-    is_bengali = any(ord(c) > 127 for c in content)
+    is_bengali = contains_bengali(content)
     
     task_description = f"""Create a short, impactful headline (5-10 words) for the following content.
     The headline should be in the same language as the input content.
@@ -65,7 +106,100 @@ def create_headline_task(content: str) -> Task:
         agent=headline_agent
     )
 
-def create_news_analysis_task(query: str, location: str = None) -> Task:
+def gather_news_articles(query: str, location: str = None) -> List[Dict[str, str]]:
+    """Search for news articles and scrape all of them concurrently.
+    
+    Articles whose page could not be scraped get no 'content' and are summarized
+    from their search snippet, or left out if they have no snippet either.
+    """
+    articles = web_search_tool.search_news(query, location)
+    if not articles:
+        return []
+    
+    contents = asyncio.run(web_tool.scrape_many([article['url'] for article in articles]))
+    
+    gathered = []
+    for article, content in zip(articles, contents):
+        if content is not None:
+            article['content'] = content[:MAX_ARTICLE_CHARS]
+        elif not article['description']:
+            continue
+        gathered.append(article)
+    return gathered
+
+def _article_source_text(article: Dict[str, str]) -> str:
+    """The article text a summary task works from."""
+    if 'content' in article:
+        return article['content']
+    return """The article page could not be retrieved, so only the search snippet above is available.
+            Base the summary on the snippet alone and start it with "(Based on the search snippet)"."""
+
+def create_article_summary_tasks(articles: List[Dict[str, str]]) -> List["Task"]:
+    from crewai import Task
+    from agents.domain_agents import create_article_summarizer_agent
+    
+    # One asynchronous task per article so the summaries are generated in parallel.
+    # Each task gets its own agent, since agents are not safe to share across threads.
+    return [
+        Task(
+            description=f"""Summarize the following scraped news article.
+            
+            Provide:
+            1. Article title
+            2. Source name
+            3. Publication date
+            4. Article URL (as a clickable link)
+            5. A brief summary (2-3 sentences)
+            
+            Format your response as a markdown section:
+            **Title:** [Article Title]
+            **Source:** [Source Name]
+            **Date:** [Publication Date]
+            **URL:** [Clickable Link]
+            **Summary:** [Brief summary]
+            
+            URL: {article['url']}
+            Source: {article['source']}
+            Search snippet: {article['description']}
+            
+            {_article_source_text(article)}""",
+            expected_output="A markdown section with the title, source, date, URL and a brief summary of the article",
+            agent=create_article_summarizer_agent(),
+            async_execution=True
+        )
+        for article in articles
+    ]
+
+def create_news_analysis_task(query: str, location: str = None, article_tasks: List["Task"] = None) -> "Task":
+    from crewai import Task
+    from agents.domain_agents import news_analyst_agent
+    
+    if article_tasks:
+        return Task(
+            description=f"""Compile the news article summaries provided as context into a report about '{query}' {f'in {location}' if location else ''}.
+            Leave out articles that do not directly relate to the topic and location.
+            Keep each article's title, source, date, URL and summary exactly as provided.
+            
+            Format your response as a markdown list with clear sections for each article.
+            Example format:
+            ### Article 1
+            **Title:** [Article Title]
+            **Source:** [Source Name]
+            **Date:** [Publication Date]
+            **URL:** [Clickable Link]
+            **Summary:** [Brief summary]""",
+            expected_output="""A well-formatted list of news articles, each containing:
+            - Title
+            - Source
+            - Publication date
+            - URL
+            - Brief summary
+            All formatted in markdown with proper sections and clickable links.""",
+            agent=news_analyst_agent,
+            context=article_tasks
+        )
+    
+    # Fall back to letting the analyst search and scrape with its tools
     return Task(
         description=f"""Search for recent news articles about '{query}' {f'in {location}' if location else ''}.
         Use the web search tool to find relevant news articles from reliable sources.
@@ -104,49 +238,44 @@ def create_news_analysis_task(query: str, location: str = None) -> Task:
         agent=news_analyst_agent
     )
 
-def create_translation_task(text: str, target_lang: str) -> Task:
-    # Split text into chunks
-    chunks = split_into_chunks(text)
-    stats = get_text_stats(text)
+def create_translation_task(bundle: TextBundle, target_lang: str, pre_translated_chunks: List[str]) -> "Task":
+    from crewai import Task
+    from agents.domain_agents import translator_agent
+    
+    stats = get_text_stats(bundle)
     
     # Create chunk text with proper formatting
     chunk_text = ""
-    for i, chunk in enumerate(chunks):
+    for i, chunk in enumerate(pre_translated_chunks):
         chunk_text += f"Chunk {i+1}:\n{chunk}\n\n"
     
-    task_description = f"""Translate the following text to {target_lang}.
+    task_description = f"""Refine the following translation to {target_lang}.
     Text Statistics: {format_stats(stats)}
-    The text has been split into {len(chunks)} chunks for better processing.
-    First, use the translation tool to perform the initial translation of each chunk.
-    Then, analyze and refine the translations to ensure they are natural and culturally appropriate.
+    The text was split into {len(pre_translated_chunks)} chunks, each already translated with the translation tool.
+    Do not translate the chunks again. Analyze and refine the translations to ensure they are natural and culturally appropriate,
+    then combine them into a coherent text.
     
-    Text chunks to translate:
+    Initial Translations:
     {chunk_text}"""
 
     # Add special instructions for Bengali translations
     if target_lang == "bn":
         task_description += """
         
-        For Bengali translations:
-        1. First, use the translation tool to get the initial translation of each chunk
-        2. Then, analyze each Bengali chunk and improve it to:
+        For Bengali translations, improve each chunk to:
            - Make it more natural and well-mannered
            - Use proper Bengali grammar and sentence structure
            - Ensure cultural appropriateness
            - Maintain formal tone where appropriate
-           - Use proper Bengali punctuation and formatting
-        3. Finally, combine all chunks into a coherent text
-        
-        Format your response exactly as follows:
-        Initial Translations:
-        [paste the initial translations from the translation tool here, chunk by chunk]
-        
-        Refined Translation:
-        [paste your refined and combined version here]"""
+           - Use proper Bengali punctuation and formatting"""
+
+    task_description += """
+    
+    Respond with only the refined and combined translation."""
 
     return Task(
         description=task_description,
-        expected_output="A natural and accurate translation in the target language, with additional refinement for Bengali translations",
+        expected_output="A natural and accurate translation in the target language, refined from the initial translations",
         agent=translator_agent
     )
 
@@ -162,8 +291,8 @@ def save_translation(text: str, translation: str, target_lang: str) -> None:
         "timestamp": timestamp
     }
     
-    with open(filename, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    with open(filename, "wb") as f:
+        f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
     
     return filename
 
@@ -183,9 +312,12 @@ def main():
             if content:
                 with st.spinner("Generating summary..."):
                     try:
+                        from crewai import Crew
+                        from agents.domain_agents import summarizer_agent
+                        
                         task = create_summarization_task(content)
                         crew = Crew(agents=[summarizer_agent], tasks=[task], verbose=True)
-                        result = crew.kickoff()
+                        result = kickoff_streaming(crew)
                         st.success("Summary:")
                         st.write(result)
                     except Exception as e:
@@ -200,9 +332,12 @@ def main():
             if content:
                 with st.spinner("Generating headline..."):
                     try:
+                        from crewai import Crew
+                        from agents.domain_agents import headline_agent
+                        
                         task = create_headline_task(content)
                         crew = Crew(agents=[headline_agent], tasks=[task], verbose=True)
-                        result = crew.kickoff()
+                        result = kickoff_streaming(crew)
                         st.success("Generated Headline:")
                         st.write(result)
                     except Exception as e:
@@ -217,13 +352,23 @@ def main():
         if st.button("Analyze News"):
             if query:
                 with st.spinner("Searching for news articles..."):
-                    task = create_news_analysis_task(query, location if location else None)
-                    crew = Crew(agents=[news_analyst_agent], tasks=[task], verbose=True)
-                    result = crew.kickoff()
-                    
-                    # Display results in a more organized way
-                    st.success("News Analysis Results:")
-                    st.markdown(result)
+                    try:
+                        from crewai import Crew
+                        from agents.domain_agents import news_analyst_agent
+                        
+                        articles = gather_news_articles(query, location if location else None)
+                        article_tasks = create_article_summary_tasks(articles)
+                        task = create_news_analysis_task(query, location if location else None, article_tasks)
+                        agents = [article_task.agent for article_task in article_tasks] + [news_analyst_agent]
+                        crew = Crew(agents=agents, tasks=[*article_tasks, task], verbose=True)
+                        result = kickoff_streaming(crew)
+                        
+                        # Display results in a more organized way
+                        st.success("News Analysis Results:")
+                        st.markdown(result)
+                    except Exception as e:
+                        st.error(f"Error analyzing news: {str(e)}")
+                        st.info("Please try again with a different topic or location.")
             else:
                 st.warning("Please enter a news topic or keywords.")
 
@@ -232,8 +377,8 @@ def main():
         
         # Show text statistics
         if text:
-            stats = get_text_stats(text)
-            st.info(format_stats(stats))
+            stats, stats_summary = get_stats_summary(text)
+            st.info(stats_summary)
             
             # Warning for very long texts
             if stats["characters"] > 10000:
@@ -260,68 +405,74 @@ def main():
         if st.button("Translate"):
             if text:
                 try:
-                    # Clear translation cache if it gets too large
-                    if len(translation_tool._translation_cache) > 1000:
-                        translation_tool.clear_cache()
+                    from utils.vector_store import get_vector_store
+                    vector_store = get_vector_store()
+                    
+                    # Scan the text once for chunking and the translation task
+                    bundle = make_bundle(text)
                     
                     # Split text into chunks
-                    chunks = split_into_chunks(text)
+                    chunks = split_into_translation_chunks(bundle)
                     
                     # Create progress bar
                     progress_bar = st.progress(0)
                     status_text = st.empty()
                     
-                    # Translate each chunk
-                    translated_chunks = []
-                    for i, chunk in enumerate(chunks):
-                        status_text.text(f"Translating chunk {i+1} of {len(chunks)}...")
-                        translated_chunk = translation_tool.translate_text(chunk, target_lang)
-                        translated_chunks.append(translated_chunk)
-                        progress_bar.progress((i + 1) / len(chunks))
+                    # Translate chunks concurrently, keeping results in chunk order
+                    status_text.text(f"Translating {len(chunks)} chunks...")
+                    def update_progress(done: int, total: int):
+                        status_text.text(f"Translated chunk {done} of {total}...")
+                        progress_bar.progress(done / total)
+                    
+                    translated_chunks = translation_tool.translate_many(
+                        chunks, target_lang, progress_callback=update_progress
+                    )
                     
                     # Store translations in vector store for RAG
-                    vector_store.add_documents(
+                    timestamp = datetime.now().isoformat(timespec="seconds")
+                    vector_store.queue_documents(
                         documents=translated_chunks,
                         metadatas=[{
                             "type": "translation",
                             "chunk_index": i,
                             "target_lang": target_lang,
-                            "timestamp": str(datetime.now())
+                            "timestamp": timestamp
                         } for i in range(len(translated_chunks))]
                     )
                     
-                    # Create and run the task for refinement
-                    task = create_translation_task(text, target_lang)
-                    crew = Crew(agents=[translator_agent], tasks=[task], verbose=True)
-                    result = crew.kickoff()
-                    
-                    # Display results differently for Bengali translations
+                    # Only Bengali gets an LLM refinement pass; other languages use the tool output as is
                     if target_lang == "bn":
+                        from crewai import Crew
+                        from agents.domain_agents import translator_agent
+                        
+                        status_text.text("Refining translation...")
+                        task = create_translation_task(bundle, target_lang, translated_chunks)
+                        crew = Crew(agents=[translator_agent], tasks=[task], verbose=True)
+                        result = kickoff_streaming(crew)
+                        
+                        initial = "\n\n".join(translated_chunks)
+                        refined = result.split("Refined Translation:")[-1].strip()
+                        
                         st.success("Translation Results:")
-                        if "Initial Translations:" in result and "Refined Translation:" in result:
-                            initial = result.split("Initial Translations:")[1].split("Refined Translation:")[0].strip()
-                            refined = result.split("Refined Translation:")[1].strip()
-                            
-                            st.markdown("### Initial Translations")
-                            st.write(initial)
-                            st.markdown("### Refined Translation")
-                            st.write(refined)
-                            
-                            # Save translation
-                            filename = save_translation(text, refined, target_lang)
-                            st.download_button(
-                                label="Download Translation",
-                                data=json.dumps({
-                                    "original": text,
-                                    "initial_translations": initial,
-                                    "refined_translation": refined
-                                }, ensure_ascii=False, indent=2),
-                                file_name=filename,
-                                mime="application/json"
-                            )
-                        else:
-                            st.write(result)
+                        st.markdown("### Initial Translations")
+                        st.write(initial)
+                        st.markdown("### Refined Translation")
+                        st.write(refined)
+                        
+                        # Save translation
+                        filename = save_translation(text, refined, target_lang)
+                        st.download_button(
+                            label="Download Translation",
+                            data=orjson.dumps({
+                                "original": text,
+                                "initial_translations": initial,
+                                "refined_translation": refined
+                            }, option=orjson.OPT_INDENT_2),
+                            file_name=filename,
+                            mime="application/json"
+                        )
                     else:
+                        result = combine_chunks(translated_chunks)
                         st.success("Translation:")
                         st.write(result)
                         
@@ -329,10 +480,10 @@ def main():
                         filename = save_translation(text, result, target_lang)
                         st.download_button(
                             label="Download Translation",
-                            data=json.dumps({
+                            data=orjson.dumps({
                                 "original": text,
                                 "translation": result
-                            }, ensure_ascii=False, indent=2),
+                            }, option=orjson.OPT_INDENT_2),
                             file_name=filename,
                             mime="application/json"
                         )
@@ -353,6 +504,9 @@ def main():
             if query:
                 with st.spinner("Searching for similar content..."):
                     try:
+                        from utils.vector_store import get_vector_store
+                        vector_store = get_vector_store()
+                        
                         results = vector_store.search(query)
                         st.success("Similar Content Found:")
                         for i, (doc, metadata) in enumerate(zip(results['documents'][0], results['metadatas'][0])):
@@ -1,4 +1,7 @@
 import os
+import atexit
+import threading
+from functools import lru_cache
 from typing import List
 from langchain.vectorstores import Chroma
 from langchain.embeddings import HuggingFaceEmbeddings
@@ -7,38 +10,60 @@ from langchain.schema import Document
 from utils.config import VECTOR_DB_DIR
 
 
-# Initialize the embedding model
-embedder = HuggingFaceEmbeddings(model_name="sentence-transformers/all-MiniLM-L6-v2")
+@lru_cache(maxsize=1)
+def get_embedder() -> HuggingFaceEmbeddings:
+    """
+    Load the embedding model on first use, encoding documents in large batches.
+    """
+    # torch is only needed once RAG is actually used
+    from utils.embeddings import get_embedding_device, quantize_for_cpu
+
+    device = get_embedding_device()
+    embedder = HuggingFaceEmbeddings(
+        model_name="sentence-transformers/all-MiniLM-L6-v2",
+        model_kwargs={"device": device},
+        encode_kwargs={"batch_size": 64},
+    )
+    if device == "cpu":
+        # int8 weights run on the CPU's integer dot-product units
+        embedder.client = quantize_for_cpu(embedder.client)
+    return embedder
+
+
+_VDB = None
+_VDB_LOCK = threading.Lock()
+
+
+def _get_vdb() -> Chroma:
+    """
+    Return the shared Chroma handle, opening the persisted DB on first use.
+    """
+    global _VDB
+    if _VDB is None:
+        with _VDB_LOCK:
+            if _VDB is None:
+                _VDB = Chroma(persist_directory=VECTOR_DB_DIR, embedding_function=get_embedder())
+                # Flush to disk once on shutdown rather than after every write
+                atexit.register(_VDB.persist)
+    return _VDB
 
 
 def create_vector_db_from_text(text: str) -> Chroma:
     """
-    Split text into chunks, embed, and create Chroma vector store.
+    Split text into chunks, embed, and add them to the Chroma vector store.
     """
     text_splitter = RecursiveCharacterTextSplitter(chunk_size=500, chunk_overlap=50)
     docs = text_splitter.create_documents([text])
 
-    vectordb = Chroma.from_documents(
-        documents=docs,
-        embedding=embedder,
-        persist_directory=VECTOR_DB_DIR,
-    )
-
-    vectordb.persist()
-    return vectordb
+    return create_vector_db_from_documents(docs)
 
 
 def create_vector_db_from_documents(docs: List[Document]) -> Chroma:
     """
     Use if you already have a list of LangChain Document objects.
     """
-    vectordb = Chroma.from_documents(
-        documents=docs,
-        embedding=embedder,
-        persist_directory=VECTOR_DB_DIR,
-    )
-
-    vectordb.persist()
+    vectordb = _get_vdb()
+    vectordb.add_documents(docs)
     return vectordb
 
 
@@ -46,16 +71,14 @@ def load_vector_db() -> Chroma:
     """
     Load a persisted Chroma vector DB from disk.
     """
-    return Chroma(persist_directory=VECTOR_DB_DIR, embedding_function=embedder)
+    return _get_vdb()
 
 
 def query_vector_db(query: str, k: int = 5) -> List[Document]:
     """
     Search for top-k similar documents from the vector DB.
     """
-    vectordb = load_vector_db()
-    results = vectordb.similarity_search(query, k=k)
-    return results
+    return _get_vdb().similarity_search(query, k=k)
 
 
 def get_context_from_query(query: str, k: int = 5) -> str:
@@ -9,8 +9,18 @@ GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 # Vector DB Configuration
 VECTOR_DB_DIR = "data/vectordb"
 
+# LLM response cache
+LLM_CACHE_PATH = "data/llm_cache.db"
+
+# Extracted document text cache
+CACHE_DIR = "data/cache"
+
 # Search Configuration
 DEFAULT_NEWS_COUNT = 5
+# Characters of each scraped article passed to the LLM
+MAX_ARTICLE_CHARS = 4000
+# Bytes of each article page downloaded before parsing
+MAX_PAGE_BYTES = 2 * 1024 * 1024
 SEARCH_ENGINE_URL = "https://www.google.com/search"
 NEWS_SOURCES = [
     "reuters.com",
@@ -34,3 +44,13 @@ SUPPORTED_LANGUAGES = {
     "ko": "Korean",
     "bn": "Bengali"
 }
+
+# Maximum number of concurrent translation requests
+MAX_TRANSLATION_WORKERS = 8
+
+# Maximum number of cached translations kept in memory
+TRANSLATION_CACHE_SIZE = 1000
+
+# Persistent translation cache, kept below the in-memory one
+TRANSLATION_CACHE_DIR = "data/translation_cache"
+TRANSLATION_CACHE_DISK_LIMIT = int(1e9)
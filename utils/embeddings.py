@@ -0,0 +1,41 @@
+import torch
+from chromadb.api.types import Documents, EmbeddingFunction, Embeddings
+
+
+def get_embedding_device() -> str:
+    """Return the device embedding models should run on."""
+    return "cuda" if torch.cuda.is_available() else "cpu"
+
+
+def quantize_for_cpu(model: torch.nn.Module) -> torch.nn.Module:
+    """
+    Quantize the Linear layers of a model to int8 for faster CPU inference.
+
+    Args:
+        model (torch.nn.Module): Model to quantize, e.g. a SentenceTransformer
+
+    Returns:
+        torch.nn.Module: A quantized copy of the model
+    """
+    return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+class SentenceTransformerEmbedding(EmbeddingFunction):
+    """Chroma embedding function for a SentenceTransformer, int8 on CPU."""
+
+    def __init__(self, model_name: str = "all-MiniLM-L6-v2", batch_size: int = 64):
+        from sentence_transformers import SentenceTransformer
+
+        device = get_embedding_device()
+        self.model = SentenceTransformer(model_name, device=device)
+        if device == "cpu":
+            self.model = quantize_for_cpu(self.model)
+        self.batch_size = batch_size
+
+    def __call__(self, input: Documents) -> Embeddings:
+        embeddings = self.model.encode(
+            list(input),
+            batch_size=self.batch_size,
+            convert_to_numpy=True,
+        )
+        return embeddings.tolist()
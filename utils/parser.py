@@ -2,12 +2,95 @@ import fitz  # PyMuPDF
 import pytesseract
 from PIL import Image
 import os
+import hashlib
+import tempfile
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from utils.config import CACHE_DIR
 
-def extract_text_from_pdf(filepath):
-    doc = fitz.open(filepath)
-    text = "\n".join([page.get_text() for page in doc])
+# Tall images are OCR'd as horizontal bands of at least this many pixels
+OCR_MIN_BAND_HEIGHT = 1000
+# Rows whose grey levels vary less than this hold no ink, so bands are cut there
+OCR_BLANK_ROW_RANGE = 24
+
+def _text_cache_path(filepath, mtime, size):
+    """Path of the on-disk text cache for one version of a file"""
+    key = f"{os.path.abspath(filepath)}:{mtime}:{size}"
+    return os.path.join(CACHE_DIR, f"{hashlib.sha1(key.encode('utf-8')).hexdigest()}.txt")
+
+@lru_cache(maxsize=64)
+def _extract_text_from_pdf(filepath, mtime, size):
+    cache_path = _text_cache_path(filepath, mtime, size)
+    if os.path.exists(cache_path):
+        with open(cache_path, encoding="utf-8") as f:
+            return f.read()
+
+    # PyMuPDF documents are not thread-safe, so pages are read in order
+    with fitz.open(filepath) as doc:
+        text = "\n".join([page.get_text() for page in doc])
+
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    # A unique temp file per writer, so concurrent extractions can't clobber each other
+    fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_path, cache_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
     return text
 
+def extract_text_from_pdf(filepath):
+    # Keyed on modification time and size so edited files are re-extracted
+    stat = os.stat(filepath)
+    return _extract_text_from_pdf(filepath, stat.st_mtime, stat.st_size)
+
+def _band_cuts(img, n_bands):
+    """Rows to cut an image at, each in the middle of the widest ink-free gap near an even split"""
+    gray = np.asarray(img.convert("L"))
+    blank = np.ptp(gray, axis=1) < OCR_BLANK_ROW_RANGE
+    height = len(blank)
+    band_height = height / n_bands
+    window = int(band_height // 4)
+
+    cuts = []
+    for k in range(1, n_bands):
+        target = int(k * band_height)
+        lo, hi = target - window, target + window
+        rows = np.flatnonzero(blank[lo:hi]) + lo
+        if not len(rows):
+            # No gap between lines near here, so don't cut through the text
+            continue
+        # Split the blank rows into runs of consecutive rows
+        runs = np.split(rows, np.flatnonzero(np.diff(rows) > 1) + 1)
+        best = max(runs, key=lambda run: (len(run), -abs(int(run.mean()) - target)))
+        cuts.append(int(best[len(best) // 2]))
+    return cuts
+
+def _merge_band_texts(texts):
+    """Join OCR output of consecutive bands, keeping their blank lines and the final page break"""
+    texts = [text for text in texts if text.strip()]
+    if not texts:
+        return ""
+    trailer = texts[-1][len(texts[-1].rstrip()):]
+    return "\n".join(text.rstrip() for text in texts) + trailer
+
 def extract_text_from_image(filepath):
     img = Image.open(filepath)
-    return pytesseract.image_to_string(img)
+    width, height = img.size
+    n_bands = min(os.cpu_count() or 1, height // OCR_MIN_BAND_HEIGHT)
+    if n_bands < 2:
+        return pytesseract.image_to_string(img)
+
+    cuts = _band_cuts(img, n_bands)
+    if not cuts:
+        return pytesseract.image_to_string(img)
+
+    # Each band runs in its own tesseract process; threads only wait on them
+    edges = [0, *cuts, height]
+    bands = [img.crop((0, top, width, bottom)) for top, bottom in zip(edges, edges[1:])]
+    with ThreadPoolExecutor(max_workers=len(bands)) as executor:
+        texts = list(executor.map(pytesseract.image_to_string, bands))
+    return _merge_band_texts(texts)
@@ -1,12 +1,112 @@
-from typing import List, Dict, Tuple
-import re
+from typing import List, Dict, Tuple, Union
+from collections import namedtuple
 from datetime import datetime
+from functools import partial
+import numpy as np
 
-def split_into_chunks(text: str, max_chunk_size: int = 5000) -> List[str]:
+try:
+    from numba import njit
+except ImportError:  # Numba is optional; the packing loop then runs as plain Python
+    def njit(*args, **kwargs):
+        return lambda func: func
+
+# Code points treated as whitespace by str.split() (the same set as the regex \s class)
+_WHITESPACE = np.array([c for c in range(0x3001) if chr(c).isspace()], dtype=np.uint32)
+# Punctuation that ends a sentence when followed by whitespace
+_SENTENCE_END = np.array([ord(c) for c in '.!?'], dtype=np.uint32)
+# Unicode block of the Bengali script
+_BENGALI_FIRST, _BENGALI_LAST = 0x0980, 0x09FF
+
+# Everything the chunking, statistics and language checks need, computed in one scan
+TextBundle = namedtuple("TextBundle", "text codepoints sent_offsets word_count char_count max_codepoint")
+
+def _to_codepoints(text: str) -> np.ndarray:
+    """Return the text as an array of Unicode code points."""
+    return np.frombuffer(text.encode('utf-32-le', 'surrogatepass'), dtype=np.uint32)
+
+def _sentence_spans(codepoints: np.ndarray, is_space: np.ndarray) -> np.ndarray:
+    """
+    Find sentence boundaries: a whitespace run directly after '.', '!' or '?'.
+    Args:
+        codepoints: The text as an array of code points
+        is_space: Whitespace mask of the code points
+    Returns:
+        Array of (start, end) offsets, one row per sentence, whitespace between sentences excluded
+    """
+    run_starts = np.flatnonzero(is_space & ~np.concatenate(([False], is_space[:-1])))
+    run_ends = np.flatnonzero(is_space & ~np.concatenate((is_space[1:], [False]))) + 1
+    
+    # Keep only the whitespace runs preceded by sentence-ending punctuation
+    preceding = codepoints[np.maximum(run_starts - 1, 0)]
+    breaks = (run_starts > 0) & np.isin(preceding, _SENTENCE_END)
+    
+    starts = np.concatenate(([0], run_ends[breaks]))
+    ends = np.concatenate((run_starts[breaks], [len(codepoints)]))
+    return np.stack((starts, ends), axis=1)
+
+@njit(cache=True)
+def _pack_offsets(lengths: np.ndarray, max_size: int) -> np.ndarray:
+    """
+    Greedily pack pieces, joined by single spaces, into chunks of at most max_size.
+    Args:
+        lengths: Length of each piece as an int64 array
+        max_size: Maximum size of each chunk
+    Returns:
+        Indices of the pieces that start a new chunk, excluding the first one
+    """
+    cuts = np.empty(len(lengths), dtype=np.int64)
+    n_cuts = 0
+    size = 0
+    for i in range(len(lengths)):
+        length = lengths[i]
+        if size + length + 1 <= max_size:
+            size += length + 1
+        else:
+            if i > 0:
+                cuts[n_cuts] = i
+                n_cuts += 1
+            size = length
+    return cuts[:n_cuts]
+
+def _lengths(pieces: List[str]) -> np.ndarray:
+    """Return the length of each piece as an int64 array."""
+    return np.fromiter(map(len, pieces), dtype=np.int64, count=len(pieces))
+
+def _join_packed(pieces: List[str], lengths: np.ndarray, max_size: int) -> List[str]:
+    """Join pieces into chunks at the offsets chosen by _pack_offsets."""
+    bounds = [0, *_pack_offsets(lengths, max_size).tolist(), len(pieces)]
+    return [' '.join(pieces[start:end]) for start, end in zip(bounds, bounds[1:]) if start < end]
+
+def make_bundle(text: str) -> TextBundle:
+    """
+    Scan the text once, collecting what split_into_chunks, get_text_stats and contains_bengali need.
+    Args:
+        text: The text to scan
+    Returns:
+        TextBundle for the text
+    """
+    codepoints = _to_codepoints(text)
+    is_space = np.isin(codepoints, _WHITESPACE)
+    # A word starts at every non-whitespace character that follows whitespace
+    word_starts = ~is_space & np.concatenate(([True], is_space[:-1]))
+    
+    return TextBundle(
+        text=text,
+        codepoints=codepoints,
+        sent_offsets=_sentence_spans(codepoints, is_space),
+        word_count=int(word_starts.sum()),
+        char_count=len(text),
+        max_codepoint=int(codepoints.max()) if len(codepoints) else 0
+    )
+
+def _as_bundle(text: Union[str, TextBundle]) -> TextBundle:
+    return text if isinstance(text, TextBundle) else make_bundle(text)
+
+def split_into_chunks(text: Union[str, TextBundle], max_chunk_size: int = 5000) -> List[str]:
     """
     Split text into chunks while trying to maintain sentence boundaries.
     Args:
-        text: The text to split
+        text: The text to split, or its TextBundle
         max_chunk_size: Maximum size of each chunk
     Returns:
         List of text chunks
@@ -15,77 +115,62 @@ def split_into_chunks(text: str, max_chunk_size: int = 5000) -> List[str]:
         return []
     
     # Split into sentences first
-    sentences = re.split(r'(?<=[.!?])\s+', text)
+    bundle = _as_bundle(text)
+    text = bundle.text
+    sentences = [sentence for sentence in (text[start:end].strip() for start, end in bundle.sent_offsets.tolist()) if sentence]
+    lengths = _lengths(sentences)
     chunks = []
-    current_chunk = []
-    current_size = 0
+    pending = 0
     
-    for sentence in sentences:
-        sentence = sentence.strip()
-        if not sentence:
-            continue
-            
-        # If a single sentence is longer than max_chunk_size, split it further
-        if len(sentence) > max_chunk_size:
-            if current_chunk:
-                chunks.append(' '.join(current_chunk))
-                current_chunk = []
-                current_size = 0
-            
-            # Split long sentence into smaller parts
-            words = sentence.split()
-            temp_chunk = []
-            temp_size = 0
-            
-            for word in words:
-                if temp_size + len(word) + 1 <= max_chunk_size:
-                    temp_chunk.append(word)
-                    temp_size += len(word) + 1
-                else:
-                    if temp_chunk:
-                        chunks.append(' '.join(temp_chunk))
-                    temp_chunk = [word]
-                    temp_size = len(word)
-            
-            if temp_chunk:
-                chunks.append(' '.join(temp_chunk))
-            continue
-        
-        # Normal case: add sentence to current chunk if it fits
-        if current_size + len(sentence) + 1 <= max_chunk_size:
-            current_chunk.append(sentence)
-            current_size += len(sentence) + 1
-        else:
-            if current_chunk:
-                chunks.append(' '.join(current_chunk))
-            current_chunk = [sentence]
-            current_size = len(sentence)
+    # Sentences longer than max_chunk_size are split further, by words
+    for i in np.flatnonzero(lengths > max_chunk_size).tolist():
+        chunks.extend(_join_packed(sentences[pending:i], lengths[pending:i], max_chunk_size))
+        words = sentences[i].split()
+        chunks.extend(_join_packed(words, _lengths(words), max_chunk_size))
+        pending = i + 1
     
-    if current_chunk:
-        chunks.append(' '.join(current_chunk))
+    # Normal case: pack the remaining sentences into chunks
+    chunks.extend(_join_packed(sentences[pending:], lengths[pending:], max_chunk_size))
     
     return chunks
 
+# Chunk size used for translation, matching Google Translate's per-request limit
+TRANSLATION_CHUNK_SIZE = 5000
+
+# split_into_chunks bound to the translation chunk size
+split_into_translation_chunks = partial(split_into_chunks, max_chunk_size=TRANSLATION_CHUNK_SIZE)
+
+def contains_bengali(text: Union[str, TextBundle]) -> bool:
+    """Check whether the text, or its TextBundle, contains any character from the Bengali script."""
+    if isinstance(text, TextBundle):
+        if text.max_codepoint < _BENGALI_FIRST:
+            return False
+        codepoints = text.codepoints
+    else:
+        # Only a range test is needed, so skip the full bundle scan
+        if text.isascii():
+            return False
+        codepoints = _to_codepoints(text)
+    return bool(((codepoints >= _BENGALI_FIRST) & (codepoints <= _BENGALI_LAST)).any())
+
 def combine_chunks(chunks: List[str]) -> str:
     """Combine chunks back into a single text."""
     return ' '.join(chunks)
 
-def get_text_stats(text: str) -> Dict[str, int]:
+def get_text_stats(text: Union[str, TextBundle]) -> Dict[str, int]:
     """
-    Get statistics about the text.
+    Get statistics about the text, or its TextBundle.
     Returns:
         Dictionary containing character count, word count, and sentence count
     """
-    if not text:
+    bundle = _as_bundle(text)
+    if not bundle.text:
         return {"characters": 0, "words": 0, "sentences": 0}
     
-    sentences = re.split(r'(?<=[.!?])\s+', text)
-    words = text.split()
-    
     return {
-        "characters": len(text),
-        "words": len(words),
-        "sentences": len(sentences)
+        "characters": bundle.char_count,
+        "words": bundle.word_count,
+        "sentences": len(bundle.sent_offsets)
     }
 
 def process_batch(texts: List[str], max_chunk_size: int = 5000) -> List[Tuple[str, List[str], Dict[str, int]]]:
@@ -99,8 +184,9 @@ def process_batch(texts: List[str], max_chunk_size: int = 5000) -> List[Tuple[st
     """
     results = []
     for text in texts:
-        chunks = split_into_chunks(text, max_chunk_size)
-        stats = get_text_stats(text)
+        bundle = make_bundle(text)
+        chunks = split_into_chunks(bundle, max_chunk_size)
+        stats = get_text_stats(bundle)
         results.append((text, chunks, stats))
     return results
 
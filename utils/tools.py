@@ -1,18 +1,121 @@
-from typing import List, Dict
+from typing import List, Dict, Callable, Optional
+import asyncio
+import aiohttp
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from deep_translator import GoogleTranslator
-from bs4 import BeautifulSoup
-from utils.config import SUPPORTED_LANGUAGES, SEARCH_ENGINE_URL, NEWS_SOURCES, DEFAULT_NEWS_COUNT
+import diskcache
+from bs4 import BeautifulSoup, SoupStrainer
+from selectolax.lexbor import LexborHTMLParser
+from lxml import html as lxml_html
+from utils.config import SUPPORTED_LANGUAGES, SEARCH_ENGINE_URL, NEWS_SOURCES, DEFAULT_NEWS_COUNT, MAX_PAGE_BYTES, MAX_TRANSLATION_WORKERS, TRANSLATION_CACHE_SIZE, TRANSLATION_CACHE_DIR, TRANSLATION_CACHE_DISK_LIMIT
+import hashlib
+from html import unescape as html_unescape
 import urllib.parse
 import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from functools import lru_cache
 
+# Sent by every web tool. Compressed responses are decoded transparently by
+# requests and aiohttp; br needs the brotli package.
+_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept-Encoding': 'gzip, deflate, br',
+    'Accept-Language': 'en-US,en;q=0.9',
+}
+
+def _create_session() -> requests.Session:
+    """Create an HTTP session that keeps connections alive and retries failed connects"""
+    session = requests.Session()
+    session.headers.update(_HEADERS)
+    adapter = HTTPAdapter(pool_connections=32, pool_maxsize=64, max_retries=Retry(total=3, connect=3, read=0, backoff_factor=0.3))
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+# Shared by all web tools so repeated requests to the same hosts reuse connections
+SESSION = _create_session()
+
+# Page elements that never hold article content
+_SKIPPED_TAGS = frozenset(['script', 'style', 'nav', 'footer', 'header'])
+# The skipped elements that can contain other elements
+_LAYOUT_TAGS = _SKIPPED_TAGS - {'script', 'style'}
+# Only the search result containers are needed from a results page. The class
+# is matched as a pattern because the strainer sees the unsplit attribute value.
+_NEWS_STRAINER = SoupStrainer(['div', 'article'], class_=re.compile(r'(?:^|\s)(?:g|SoaBEf)(?:\s|$)'))
+# href attribute values in raw markup, in any case and with any quoting HTML allows
+_HREF_RE = re.compile(r'''\bhref\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+))''', re.I)
+# Line breaks (as str.splitlines sees them) or runs of two spaces, with surrounding whitespace
+_TEXT_BREAK_RE = re.compile(r'\s*(?:[\n\r\v\f\x1c-\x1e\x85\u2028\u2029]|  )\s*')
+# Elements that may carry an article's publication date
+_DATE_SELECTOR = ', '.join(f"{tag}.{cls}" for tag in ('time', 'span', 'div') for cls in ('date', 'published', 'timestamp'))
+
+def _read_limited(response: requests.Response, limit: int = MAX_PAGE_BYTES) -> bytes:
+    """Read at most `limit` bytes of a streamed response body"""
+    chunks = []
+    size = 0
+    for chunk in response.iter_content(chunk_size=64 * 1024):
+        chunks.append(chunk)
+        size += len(chunk)
+        if size >= limit:
+            break
+    return b''.join(chunks)[:limit]
+
 class TranslationTool:
+    # Shared across instances so concurrent callers stay within the API rate limits
+    _request_slots = threading.BoundedSemaphore(MAX_TRANSLATION_WORKERS)
+
     def __init__(self):
-        # Initialize GoogleTranslator instance directly
-        self.translator = GoogleTranslator(source='auto')
-        # Cache for translations
-        self._translation_cache = {}
+        # GoogleTranslator keeps per-request state, so each thread gets its own instance
+        self._local = threading.local()
+        # Least-recently-used cache for translations, shared by the worker threads
+        self._translation_cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        # Persistent cache behind it, so translations survive restarts
+        self._disk_cache = diskcache.Cache(
+            TRANSLATION_CACHE_DIR,
+            size_limit=TRANSLATION_CACHE_DISK_LIMIT,
+            eviction_policy='least-recently-used'
+        )
+
+    @property
+    def translator(self) -> GoogleTranslator:
+        """GoogleTranslator instance owned by the calling thread"""
+        translator = getattr(self._local, 'translator', None)
+        if translator is None:
+            translator = self._local.translator = GoogleTranslator(source='auto')
+        return translator
+
+    def _cache_key(self, text: str, target_lang: str):
+        return (target_lang, hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest())
+
+    def _get_cached(self, cache_key):
+        with self._cache_lock:
+            result = self._translation_cache.get(cache_key)
+            if result is not None:
+                self._translation_cache.move_to_end(cache_key)
+                return result
+        
+        # diskcache is thread-safe, so read it outside the lock
+        result = self._disk_cache.get(cache_key)
+        if result is not None:
+            self._remember(cache_key, result)
+        return result
+
+    def _set_cached(self, cache_key, result: str):
+        self._disk_cache.set(cache_key, result)
+        self._remember(cache_key, result)
+
+    def _remember(self, cache_key, result: str):
+        with self._cache_lock:
+            self._translation_cache[cache_key] = result
+            self._translation_cache.move_to_end(cache_key)
+            # Evict the least recently used translation once the cache is full
+            if len(self._translation_cache) > TRANSLATION_CACHE_SIZE:
+                self._translation_cache.popitem(last=False)
 
     def translate_text(self, text: str, target_lang: str) -> str:
         """Translate text to target language with caching"""
@@ -23,13 +126,14 @@ class TranslationTool:
             raise ValueError(f"Unsupported language. Supported languages: {list(SUPPORTED_LANGUAGES.keys())}")
         
         # Check if text is already in target language
-        if target_lang == 'en' and all(ord(c) < 128 for c in text):
+        if target_lang == 'en' and text.isascii():
             return text
         
         # Use cached translation if available
-        cache_key = f"{text}_{target_lang}"
-        if cache_key in self._translation_cache:
-            return self._translation_cache[cache_key]
+        cache_key = self._cache_key(text, target_lang)
+        cached = self._get_cached(cache_key)
+        if cached is not None:
+            return cached
         
         try:
             # Set target language
@@ -37,46 +141,107 @@ class TranslationTool:
             
             # Split long text into smaller chunks for better performance
             max_chunk_size = 5000  # Google Translate's limit
-            chunks = [text[i:i + max_chunk_size] for i in range(0, len(text), max_chunk_size)]
-            
-            # Translate chunks and combine results
-            translated_chunks = []
-            for chunk in chunks:
-                try:
-                    translated = self.translator.translate(chunk)
-                    translated_chunks.append(translated)
-                except Exception as e:
-                    print(f"Error translating chunk: {e}")
-                    translated_chunks.append(chunk)  # Keep original text if translation fails
-            
-            result = ' '.join(translated_chunks)
+            failed = False
+            if len(text) <= max_chunk_size:
+                # Callers usually pass pre-split chunks, which fit in one request
+                with self._request_slots:
+                    result = self.translator.translate(text)
+            else:
+                chunks = [text[i:i + max_chunk_size] for i in range(0, len(text), max_chunk_size)]
+                
+                # Translate chunks and combine results. GoogleTranslator.translate_batch
+                # sends one request per item as well, so it would save no round trips.
+                translated_chunks = []
+                for chunk in chunks:
+                    try:
+                        with self._request_slots:
+                            translated = self.translator.translate(chunk)
+                        translated_chunks.append(translated)
+                    except Exception as e:
+                        print(f"Error translating chunk: {e}")
+                        translated_chunks.append(chunk)  # Keep original text if translation fails
+                        failed = True
+                
+                result = ' '.join(translated_chunks)
             
-            # Cache the result
-            self._translation_cache[cache_key] = result
+            # Cache the result, unless part of it is still untranslated
+            if not failed:
+                self._set_cached(cache_key, result)
             return result
             
         except Exception as e:
             print(f"Translation error: {e}")
             return text
 
+    def translate_many(self, texts: List[str], target_lang: str,
+                       progress_callback: Optional[Callable[[int, int], None]] = None) -> List[str]:
+        """
+        Translate independent texts concurrently, returning results in input order.
+        Args:
+            texts: The texts to translate
+            target_lang: Language code to translate into
+            progress_callback: Called as progress_callback(done, total) on the
+                calling thread after each text finishes
+        Returns:
+            The translated texts; a text that fails to translate is returned unchanged
+        """
+        if target_lang not in SUPPORTED_LANGUAGES:
+            raise ValueError(f"Unsupported language. Supported languages: {list(SUPPORTED_LANGUAGES.keys())}")
+        
+        total = len(texts)
+        results = [None] * total
+        
+        # Cached texts never enter the pool
+        pending = []
+        for i, text in enumerate(texts):
+            cached = self._get_cached(self._cache_key(text, target_lang)) if text else None
+            if cached is not None:
+                results[i] = cached
+            else:
+                pending.append(i)
+        
+        done = total - len(pending)
+        if progress_callback and done:
+            progress_callback(done, total)
+        
+        if pending:
+            with ThreadPoolExecutor(max_workers=min(MAX_TRANSLATION_WORKERS, len(pending))) as executor:
+                futures = {executor.submit(self.translate_text, texts[i], target_lang): i for i in pending}
+                for future in as_completed(futures):
+                    i = futures[future]
+                    try:
+                        results[i] = future.result()
+                    except Exception as e:
+                        print(f"Error translating text: {e}")
+                        results[i] = texts[i]
+                    done += 1
+                    if progress_callback:
+                        progress_callback(done, total)
+        
+        return results
+
     def clear_cache(self):
         """Clear the translation cache"""
-        self._translation_cache.clear()
+        with self._cache_lock:
+            self._translation_cache.clear()
+        self._disk_cache.clear()
 
 class WebSearchTool:
     def __init__(self):
         self.search_url = SEARCH_ENGINE_URL
         self.news_sources = NEWS_SOURCES
         self.default_count = DEFAULT_NEWS_COUNT
-        self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
+        self.headers = _HEADERS
+        # Pooled keep-alive connections, sending our headers on every request
+        self.session = SESSION
+        
+        # Source matching is fixed per instance, so build it once
+        self._site_restriction_str = " OR ".join(f"site:{site}" for site in self.news_sources)
+        self._news_sources_lower = tuple(site.lower() for site in self.news_sources)
+        self._priority_sources = ('reuters.com', 'apnews.com', 'bbc.com')
 
     def _construct_search_query(self, topic: str, location: str = None) -> str:
         """Construct a search query for news articles"""
-        # Add site restrictions for reliable news sources
-        site_restrictions = " OR ".join([f"site:{site}" for site in self.news_sources])
-        
         # Build the query with proper formatting
         query_parts = [topic]
         if location:
@@ -89,13 +254,37 @@ class WebSearchTool:
         query = " ".join(query_parts)
         
         # Add site restrictions
-        query = f"{query} ({site_restrictions})"
+        query = f"{query} ({self._site_restriction_str})"
         
-        return urllib.parse.quote(query)
+        # Left unquoted: search_news urlencodes it with the other parameters
+        return query
+
+    def _has_trusted_links(self, html_content: str) -> bool:
+        """
+        Cheaply check whether any link in the raw markup could pass the source filter.
+        
+        Only href values are tested: the query, and with it every trusted domain,
+        is echoed elsewhere on results, consent and captcha pages. Values are
+        entity-decoded as the parser would, so no page it accepts is rejected.
+        """
+        for match in _HREF_RE.finditer(html_content):
+            url = next(value for value in match.groups() if value is not None)
+            if '&' in url:
+                url = html_unescape(url)
+            if not url.startswith('http'):
+                continue
+            url_lower = url.lower()
+            if any(source_name in url_lower for source_name in self._news_sources_lower):
+                return True
+        return False
 
     def _extract_news_links(self, html_content: str) -> List[Dict[str, str]]:
         """Extract news article links and titles from search results"""
-        soup = BeautifulSoup(html_content, 'html.parser')
+        # Skip building the tree when no result could pass the source filter
+        if not self._has_trusted_links(html_content):
+            return []
+        
+        soup = BeautifulSoup(html_content, 'lxml', parse_only=_NEWS_STRAINER)
         news_items = []
         
         # Find all search result containers
@@ -124,7 +313,8 @@ class WebSearchTool:
             source = source_div.text if source_div else ""
             
             # Only include if it's from a trusted source
-            if any(source_name in url.lower() for source_name in self.news_sources):
+            url_lower = url.lower()
+            if any(source_name in url_lower for source_name in self._news_sources_lower):
                 news_items.append({
                     'title': title.text.strip(),
                     'url': url,
@@ -134,6 +324,10 @@ class WebSearchTool:
         
         return news_items
 
+    def _is_priority_source(self, item: Dict[str, str]) -> bool:
+        url_lower = item['url'].lower()
+        return any(source in url_lower for source in self._priority_sources)
+
     def search_news(self, topic: str, location: str = None, count: int = None) -> List[Dict[str, str]]:
         """Search for news articles based on topic and location"""
         try:
@@ -151,14 +345,13 @@ class WebSearchTool:
             # Construct the full URL with parameters
             url = f"{self.search_url}?{urllib.parse.urlencode(params)}"
             
-            response = requests.get(url, headers=self.headers)
+            response = self.session.get(url, timeout=10)
             response.raise_for_status()
             
             news_items = self._extract_news_links(response.text)
             
             # Sort by source reliability (prioritize major news sources)
-            priority_sources = ['reuters.com', 'apnews.com', 'bbc.com']
-            news_items.sort(key=lambda x: any(source in x['url'].lower() for source in priority_sources), reverse=True)
+            news_items.sort(key=self._is_priority_source, reverse=True)
             
             return news_items[:count or self.default_count]
             
@@ -168,35 +361,141 @@ class WebSearchTool:
 
 class WebScrapingTool:
     def __init__(self):
-        self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
+        self.headers = _HEADERS
+        # Pooled keep-alive connections, sending our headers on every request
+        self.session = SESSION
 
     def extract_text_from_url(self, url: str) -> str:
         """Extract text content from a webpage"""
         try:
-            response = requests.get(url, headers=self.headers)
-            soup = BeautifulSoup(response.text, 'html.parser')
+            response = self.session.get(url, timeout=10)
+            # Use the charset from the Content-Type header when there is one;
+            # otherwise let lxml sniff <meta charset>
+            parser = None
+            if 'charset' in response.headers.get('Content-Type', '').lower():
+                try:
+                    parser = lxml_html.HTMLParser(encoding=response.encoding)
+                except LookupError:
+                    parser = None
+            doc = lxml_html.fromstring(response.content, parser=parser)
             
-            # Remove script and style elements
-            for script in soup(["script", "style"]):
-                script.decompose()
+            # Remove script and style elements, keeping the text that follows them
+            for script in doc.xpath('//script|//style'):
+                script.drop_tree()
             
             # Get text
-            text = soup.get_text()
+            text = doc.text_content()
             
-            # Break into lines and remove leading and trailing space
-            lines = (line.strip() for line in text.splitlines())
-            # Break multi-headlines into a line each
-            chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-            # Drop blank lines
-            text = '\n'.join(chunk for chunk in chunks if chunk)
+            # Put each line and multi-headline on its own line, dropping blank ones
+            phrases = (phrase.strip() for phrase in _TEXT_BREAK_RE.split(text))
+            text = '\n'.join(phrase for phrase in phrases if phrase)
             
             return text
         except Exception as e:
             print(f"Error scraping webpage: {e}")
             return ""
 
+    def _parse_article(self, html: str):
+        """Extract (title, date, content) from an article page with the lexbor parser"""
+        tree = LexborHTMLParser(html)
+        
+        # Scripts and styles only hold text, so they can be removed outright
+        for node in tree.css('script, style'):
+            node.decompose()
+        
+        # Skip anything inside the other unwanted elements. Checking ancestors
+        # avoids decomposing nested matches, which lexbor does not support safely.
+        def is_kept(node) -> bool:
+            parent = node.parent
+            while parent is not None:
+                if parent.tag in _LAYOUT_TAGS:
+                    return False
+                parent = parent.parent
+            return True
+        
+        def first_kept(selector: str):
+            return next((node for node in tree.css(selector) if is_kept(node)), None)
+        
+        # Extract the main content
+        # Try to find the main article content, falling back to the whole page
+        article = first_kept('article') or first_kept('main') or first_kept('div.content, div.article, div.post')
+        paragraphs = (article or tree).css('p')
+        content = '\n\n'.join(
+            text for text in (p.text().strip() for p in paragraphs if is_kept(p)) if text
+        )
+        
+        # Get the title
+        title = tree.css_first('title')
+        title_text = title.text().strip() if title else "No title found"
+        
+        # Get the publication date if available
+        date = None
+        for element in tree.css(_DATE_SELECTOR):
+            if not is_kept(element):
+                continue
+            if element.attributes.get('datetime'):
+                date = element.attributes['datetime']
+                break
+            text = element.text().strip()
+            if text:
+                date = text
+                break
+        
+        return title_text, date, content
+
+    def _parse_article_soup(self, html: bytes, encoding: str = None):
+        """Extract (title, date, content) with BeautifulSoup, for pages lexbor cannot handle"""
+        soup = BeautifulSoup(html, 'lxml', from_encoding=encoding or 'utf-8')
+        
+        # Remove unwanted elements
+        for element in soup(list(_SKIPPED_TAGS)):
+            element.decompose()
+        
+        # Extract the main content
+        # Try to find the main article content
+        article = soup.find('article') or soup.find('main') or soup.find('div', class_=['content', 'article', 'post'])
+        
+        # Get all paragraphs from the article, falling back to the whole page
+        paragraphs = (article or soup).find_all('p')
+        # Strip each paragraph's text once, then drop the empty ones
+        content = '\n\n'.join(
+            text for text in (p.get_text().strip() for p in paragraphs) if text
+        )
+        
+        # Get the title
+        title = soup.find('title')
+        title_text = title.get_text().strip() if title else "No title found"
+        
+        # Get the publication date if available
+        date = None
+        date_elements = soup.find_all(['time', 'span', 'div'], class_=['date', 'published', 'timestamp'])
+        for element in date_elements:
+            if element.get('datetime'):
+                date = element['datetime']
+                break
+            text = element.get_text().strip()
+            if text:
+                date = text
+                break
+        
+        return title_text, date, content
+
+    def _parse_page(self, html: bytes, encoding: str = None, url: str = "") -> str:
+        """Turn a downloaded article page into the scraped content string"""
+        try:
+            title_text, date, content = self._parse_article(html.decode(encoding or 'utf-8', errors='replace'))
+        except Exception as e:
+            print(f"Falling back to BeautifulSoup for {url}: {e}")
+            title_text, date, content = self._parse_article_soup(html, encoding)
+        
+        # Format the result
+        result = f"Title: {title_text}\n"
+        if date:
+            result += f"Date: {date}\n"
+        result += f"\nContent:\n{content}"
+        
+        return result
+
     def scrape_webpage(self, url: str) -> str:
         """
         Scrape content from a webpage.
@@ -206,53 +505,73 @@ class WebScrapingTool:
             The scraped content as a string
         """
         try:
-            response = requests.get(url, headers=self.headers, timeout=10)
-            response.raise_for_status()
+            # Stream the body so huge pages are cut off instead of read whole
+            with self.session.get(url, timeout=10, stream=True) as response:
+                response.raise_for_status()
+                html = _read_limited(response)
+                encoding = response.encoding
             
             # Parse the HTML content
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # Remove unwanted elements
-            for element in soup(['script', 'style', 'nav', 'footer', 'header']):
-                element.decompose()
-            
-            # Extract the main content
-            # Try to find the main article content
-            article = soup.find('article') or soup.find('main') or soup.find('div', class_=['content', 'article', 'post'])
-            
-            if article:
-                # Get all paragraphs from the article
-                paragraphs = article.find_all('p')
-                content = '\n\n'.join(p.get_text().strip() for p in paragraphs if p.get_text().strip())
-            else:
-                # Fallback to getting all paragraphs
-                paragraphs = soup.find_all('p')
-                content = '\n\n'.join(p.get_text().strip() for p in paragraphs if p.get_text().strip())
-            
-            # Get the title
-            title = soup.find('title')
-            title_text = title.get_text().strip() if title else "No title found"
-            
-            # Get the publication date if available
-            date = None
-            date_elements = soup.find_all(['time', 'span', 'div'], class_=['date', 'published', 'timestamp'])
-            for element in date_elements:
-                if element.get('datetime'):
-                    date = element['datetime']
-                    break
-                elif element.get_text().strip():
-                    date = element.get_text().strip()
-                    break
-            
-            # Format the result
-            result = f"Title: {title_text}\n"
-            if date:
-                result += f"Date: {date}\n"
-            result += f"\nContent:\n{content}"
-            
-            return result
+            return self._parse_page(html, encoding, url)
             
         except requests.RequestException as e:
             return f"Error scraping webpage: {str(e)}"
         except Exception as e:
-            return f"Error processing webpage content: {str(e)}" 
\ No newline at end of file
+            return f"Error processing webpage content: {str(e)}"
+
+    async def scrape_webpage_async(self, url: str, session: aiohttp.ClientSession) -> str:
+        """
+        Scrape content from a webpage without blocking the event loop.
+        Args:
+            url: The URL to scrape
+            session: The aiohttp session to fetch with
+        Returns:
+            The scraped content as a string
+        """
+        try:
+            return await self._fetch_page_async(url, session)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            return f"Error scraping webpage: {str(e)}"
+        except Exception as e:
+            return f"Error processing webpage content: {str(e)}"
+
+    async def _fetch_page_async(self, url: str, session: aiohttp.ClientSession) -> str:
+        """Fetch and parse a webpage, raising on failure"""
+        async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as response:
+            response.raise_for_status()
+            html = bytearray()
+            async for chunk in response.content.iter_chunked(64 * 1024):
+                html += chunk
+                if len(html) >= MAX_PAGE_BYTES:
+                    break
+            html = bytes(html[:MAX_PAGE_BYTES])
+            encoding = response.charset
+        
+        # Parsing is CPU-bound, so run it off the event loop
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._parse_page, html, encoding, url)
+
+    async def scrape_many(self, urls: List[str]) -> List[Optional[str]]:
+        """
+        Scrape several webpages concurrently.
+        Args:
+            urls: The URLs to scrape
+        Returns:
+            The scraped content of each URL, in the same order, or None for
+            pages that could not be fetched or parsed
+        """
+        connector = aiohttp.TCPConnector(limit=20, limit_per_host=4, ttl_dns_cache=300)
+        async with aiohttp.ClientSession(connector=connector, headers=self.headers) as session:
+            results = await asyncio.gather(
+                *(self._fetch_page_async(url, session) for url in urls),
+                return_exceptions=True
+            )
+        
+        contents = []
+        for url, result in zip(urls, results):
+            if isinstance(result, BaseException):
+                print(f"Error scraping {url}: {result}")
+                contents.append(None)
+            else:
+                contents.append(result)
+        return contents
@@ -1,8 +1,88 @@
 import chromadb
 from chromadb.config import Settings
-from chromadb.utils import embedding_functions
 from typing import List, Dict, Optional
+from functools import lru_cache
+import asyncio
+import atexit
 import os
+import queue
+import threading
+import time
+import uuid
+
+# Embedding is CPU-bound, so only a few async callers run it at once. A thread
+# semaphore, acquired in the worker thread, works from any event loop.
+_ASYNC_SLOTS = threading.BoundedSemaphore(4)
+
+def _run_limited(func, *args):
+    with _ASYNC_SLOTS:
+        return func(*args)
+
+class _BatchWriter:
+    def __init__(self, collection, max_batch: int = 16, max_wait: float = 1.0):
+        """
+        Write queued documents to a collection from a background thread
+        
+        Args:
+            collection: ChromaDB collection to write to
+            max_batch (int): Number of queued writes that triggers a flush
+            max_wait (float): Seconds to wait for more writes before flushing
+        """
+        self.collection = collection
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        
+        threading.Thread(target=self._run, name="vector-store-writer", daemon=True).start()
+        # Write whatever is still queued when the process exits
+        atexit.register(self.flush)
+
+    def put(self, documents: List[str], metadatas: List[Dict], ids: List[str]):
+        self._queue.put((documents, metadatas, ids))
+
+    def flush(self):
+        """Synchronously write everything queued so far, including the batch being collected"""
+        # The worker writes its current batch as soon as it reaches this marker
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait()
+
+    def _run(self):
+        while True:
+            batch, flushes = [], []
+            item = self._queue.get()
+            deadline = time.monotonic() + self.max_wait
+            while True:
+                if isinstance(item, threading.Event):
+                    flushes.append(item)
+                    break
+                batch.append(item)
+                timeout = deadline - time.monotonic()
+                if len(batch) >= self.max_batch or timeout <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+            if batch:
+                self._write(batch)
+            for done in flushes:
+                done.set()
+
+    def _write(self, batch):
+        # One add call, and so one embedding pass, for the whole batch
+        documents, metadatas, ids = [], [], []
+        for batch_documents, batch_metadatas, batch_ids in batch:
+            documents.extend(batch_documents)
+            metadatas.extend(batch_metadatas)
+            ids.extend(batch_ids)
+        
+        with self._lock:
+            try:
+                self.collection.add(documents=documents, metadatas=metadatas, ids=ids)
+            except Exception as e:
+                print(f"Error writing documents to vector store: {e}")
 
 class VectorStore:
     def __init__(self, persist_directory: str = "data/chroma_db"):
@@ -24,21 +104,27 @@ class VectorStore:
             )
         )
         
-        # Initialize the embedding function
-        self.embedding_function = embedding_functions.SentenceTransformerEmbeddingFunction(
-            model_name="all-MiniLM-L6-v2"
-        )
+        # Initialize the embedding function. torch is only needed once a store
+        # is created, so importing this module stays cheap.
+        from utils.embeddings import SentenceTransformerEmbedding
+        self.embedding_function = SentenceTransformerEmbedding(model_name="all-MiniLM-L6-v2")
         
         # Create or get the collection
         self.collection = self.client.get_or_create_collection(
             name="documents",
             embedding_function=self.embedding_function
         )
+        
+        # Background writer for queue_documents
+        self._writer = _BatchWriter(self.collection)
 
     def add_documents(self, documents: List[str], metadatas: Optional[List[Dict]] = None, ids: Optional[List[str]] = None):
         """
         Add documents to the vector store
         
+        The whole list is embedded in one batched encode, so pass large
+        lists (64 or more documents) rather than calling this in a loop.
+        
         Args:
             documents (List[str]): List of documents to add
             metadatas (Optional[List[Dict]]): List of metadata for each document
@@ -56,6 +142,37 @@ class VectorStore:
             ids=ids
         )
 
+    async def add_documents_async(self, documents: List[str], metadatas: Optional[List[Dict]] = None, ids: Optional[List[str]] = None):
+        """
+        Add documents without blocking the event loop
+        
+        Args:
+            documents (List[str]): List of documents to add
+            metadatas (Optional[List[Dict]]): List of metadata for each document
+            ids (Optional[List[str]]): List of unique IDs for each document
+        """
+        await asyncio.to_thread(_run_limited, self.add_documents, documents, metadatas, ids)
+
+    def queue_documents(self, documents: List[str], metadatas: Optional[List[Dict]] = None):
+        """
+        Add documents from a background thread without blocking the caller
+        
+        Queued writes are batched, so several calls share one embedding and
+        insert pass. Each document gets a unique ID.
+        
+        Args:
+            documents (List[str]): List of documents to add
+            metadatas (Optional[List[Dict]]): List of metadata for each document
+        """
+        if not documents:
+            return
+        
+        if metadatas is None:
+            metadatas = [{"source": f"document_{i}"} for i in range(len(documents))]
+        
+        ids = [str(uuid.uuid4()) for _ in documents]
+        self._writer.put(documents, metadatas, ids)
+
     def search(self, query: str, n_results: int = 5) -> Dict:
         """
         Search for similar documents
@@ -73,6 +190,38 @@ class VectorStore:
         )
         return results
 
+    async def search_async(self, query: str, n_results: int = 5) -> Dict:
+        """
+        Search for similar documents without blocking the event loop
+        
+        Args:
+            query (str): Query text
+            n_results (int): Number of results to return
+            
+        Returns:
+            Dict: Dictionary containing results
+        """
+        return await asyncio.to_thread(_run_limited, self.search, query, n_results)
+
+    def search_batch(self, queries: List[str], n_results: int = 5) -> Dict:
+        """
+        Search for documents similar to each of several queries
+        
+        All queries are embedded in one batched encode.
+        
+        Args:
+            queries (List[str]): Query texts
+            n_results (int): Number of results to return per query
+            
+        Returns:
+            Dict: Dictionary containing one list of results per query
+        """
+        results = self.collection.query(
+            query_texts=queries,
+            n_results=n_results
+        )
+        return results
+
     def get_document(self, doc_id: str) -> Optional[Dict]:
         """
         Get a specific document by ID
@@ -125,5 +274,7 @@ class VectorStore:
         """
         return self.collection.get()
 
-# Initialize the vector store
-vector_store = VectorStore() 
\ No newline at end of file
+@lru_cache(maxsize=1)
+def get_vector_store() -> VectorStore:
+    """Return the shared vector store, creating it on first use"""
+    return VectorStore() 
\ No newline at end of file